@@ -166,6 +166,7 @@ async def main():
         finally:
             display_info("Shutting down browsers…")
             await close_browsers(browsers)
+            maybe_write(force=True)
             await emit("shutdown")
 
 
@@ -21,6 +21,7 @@ DATA_FILES = [
     Path("data/deferred_transports.json"),
     Path("data/transport_attempts.json"),
     Path("data/destination_blacklist.json"),
+    Path("data/transport_state.json"),
     Path("data/type_caps.json"),
 ]
 
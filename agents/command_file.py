@@ -6,6 +6,7 @@ from pathlib import Path
 
 from data.config_settings import get_command_file, reload_config
 from utils.pretty_print import display_info, display_error
+from utils.runtime_flags import refresh as refresh_flags
 
 from .base import BaseAgent
 from .loader import enable_agent, disable_agent, emit
@@ -43,15 +44,18 @@ class CommandFileAgent(BaseAgent):
             try:
                 if cmd == "pause":
                     Path("PAUSE").touch()
+                    refresh_flags()
                     display_info("CommandFileAgent: pause")
                 elif cmd == "resume":
                     try:
                         Path("PAUSE").unlink()
                     except FileNotFoundError:
                         pass
+                    refresh_flags()
                     display_info("CommandFileAgent: resume")
                 elif cmd == "stop":
                     Path("STOP").touch()
+                    refresh_flags()
                     display_info("CommandFileAgent: stop")
                 elif cmd == "reload-config":
                     await emit("config_reload")
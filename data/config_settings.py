@@ -62,6 +62,7 @@ DEFAULT_CONFIG: dict[str, dict[str, Any]] = {
         "min_free_beds": "1",
         "min_free_cells": "1",
         "blacklist_ttl_min": "45",
+        "transport_workers": "1",
     },
     "backoff": {
         "enable": "true",
@@ -73,6 +74,15 @@ DEFAULT_CONFIG: dict[str, dict[str, Any]] = {
     "dispatch": {
         "ambulance_only": "false",
     },
+    "politeness": {
+        "retry_max_delay": "30",
+        "retry_attempts": "3",
+        "retry_base_delay": "0.4",
+        "gate_entry_base": "0.15",
+        "gate_entry_spread": "0.35",
+        "gate_exit_base": "0.10",
+        "gate_exit_spread": "0.25",
+    },
     "control": {
         "command_file": "commands.txt",
     },
@@ -274,6 +284,7 @@ def get_transport_prefs():
         "min_free_beds": _getint("transport_prefs", "min_free_beds", 1),
         "min_free_cells": _getint("transport_prefs", "min_free_cells", 1),
         "blacklist_ttl_min": _getint("transport_prefs", "blacklist_ttl_min", 45),
+        "transport_workers": max(1, _getint("transport_prefs", "transport_workers", 1)),
     }
 
 
@@ -288,6 +299,19 @@ def get_backoff_config():
     }
 
 
+@_cache
+def get_politeness():
+    return {
+        "retry_max_delay": _getfloat("politeness", "retry_max_delay", 30.0),
+        "retry_attempts": max(1, _getint("politeness", "retry_attempts", 3)),
+        "retry_base_delay": _getfloat("politeness", "retry_base_delay", 0.4),
+        "gate_entry_base": _getfloat("politeness", "gate_entry_base", 0.15),
+        "gate_entry_spread": _getfloat("politeness", "gate_entry_spread", 0.35),
+        "gate_exit_base": _getfloat("politeness", "gate_exit_base", 0.10),
+        "gate_exit_spread": _getfloat("politeness", "gate_exit_spread", 0.25),
+    }
+
+
 @_cache
 def get_update_repo():
     repo = _get("update", "repo", "HGFantasy/MscBot").strip()
@@ -323,7 +347,18 @@ def clear_cache() -> None:
         f.cache_clear()
 
 
+_RELOAD_HOOKS = []
+
+
+def on_reload(fn):
+    """Register ``fn`` to run after :func:`reload_config`; returns ``fn``."""
+    _RELOAD_HOOKS.append(fn)
+    return fn
+
+
 def reload_config() -> None:
     """Reload configuration from disk for hot-reload agents."""
     _load_config()
     clear_cache()
+    for fn in _RELOAD_HOOKS:
+        fn()
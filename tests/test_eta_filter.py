@@ -0,0 +1,63 @@
+import math
+import random
+import re
+
+import pytest
+
+from utils import eta_filter
+
+# The regex implementations parse_pct/parse_km replaced.
+_PCT_RE = re.compile(r"(\d+)\s*%")
+
+
+def _regex_pct(text):
+    match = _PCT_RE.search(text or "")
+    return float(match.group(1)) if match else math.inf
+
+
+def _regex_km(text):
+    text = text or ""
+    match = eta_filter._KM_RE.search(text)
+    if match:
+        return eta_filter._to_float(match.group(1))
+    match = eta_filter._M_RE.search(text)
+    if match:
+        return eta_filter._to_float(match.group(1)) / 1000.0
+    return math.inf
+
+
+def _random_rows(n, seed=1234):
+    rng = random.Random(seed)
+    alphabet = "0123456789 ,.%%kKmMx:/\t ٣abz"
+    return ["".join(rng.choices(alphabet, k=rng.randint(0, 24))) for _ in range(n)]
+
+
+EXAMPLES = [
+    None,
+    "",
+    "St. Mary Hospital 12.5 km 20 % Beds 3/10",
+    "City Jail 800 m tax 5% cells: 2/4",
+    "3 KM, 15%",
+    "% 10 %",
+    "50%% 7",
+    "no numbers here",
+    "1,5km 0 %",
+    "٣٥ %",
+    "120 mi 3 Min",
+]
+
+
+@pytest.mark.parametrize("text", EXAMPLES)
+def test_parse_pct_matches_regex_on_examples(text):
+    assert eta_filter.parse_pct(text) == _regex_pct(text)
+
+
+@pytest.mark.parametrize("text", EXAMPLES)
+def test_parse_km_matches_regex_on_examples(text):
+    assert eta_filter.parse_km(text) == _regex_km(text)
+
+
+def test_parsers_match_regex_on_random_rows():
+    for text in _random_rows(5000):
+        assert eta_filter.parse_pct(text) == _regex_pct(text), text
+        assert eta_filter.parse_km(text) == _regex_km(text), text
@@ -0,0 +1,35 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from utils import mission_data
+
+
+@pytest.fixture
+def snapshot_path(tmp_path, monkeypatch):
+    path = tmp_path / "mission_data.json"
+    monkeypatch.setattr(mission_data, "SNAPSHOT_PATH", path)
+    monkeypatch.setattr(mission_data, "_PREV", None)
+    monkeypatch.setattr(mission_data, "_PREV_STAT", None)
+    return path
+
+
+def test_fallback_rewrites_normalised_seen_ts(snapshot_path):
+    snapshot_path.write_text(
+        json.dumps({"1": {"mission_name": "Fire", "seen_ts": "x"}})
+    )
+
+    asyncio.run(mission_data.check_and_grab_missions())
+
+    assert isinstance(json.loads(snapshot_path.read_text())["1"]["seen_ts"], int)
+
+
+def test_cache_is_not_shared_with_written_snapshot(snapshot_path):
+    snap = {"1": {"mission_name": "Fire", "seen_ts": 100}}
+    mission_data.write_snapshot(snap)
+    snap["1"]["seen_ts"] = 50
+
+    assert mission_data._read_existing()["1"]["seen_ts"] == 100
@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from utils import politeness
+
+
+class PageError(Exception):
+    """Stands in for playwright's plain ``Error``."""
+
+
+@pytest.fixture
+def observed(monkeypatch):
+    seen = []
+
+    async def no_sleep(_delay):
+        return None
+
+    monkeypatch.setattr(politeness.sentinel, "observe_error", seen.append)
+    monkeypatch.setattr(politeness.asyncio, "sleep", no_sleep)
+    return seen
+
+
+def test_network_errors_are_retried_and_final_one_left_to_caller(observed):
+    calls = []
+
+    async def goto():
+        calls.append(1)
+        raise PageError("Page.goto: net::ERR_CONNECTION_RESET")
+
+    with pytest.raises(PageError, match="ERR_CONNECTION_RESET"):
+        asyncio.run(politeness.retry(goto, attempts=3, base_delay=0))
+
+    assert len(calls) == 3
+    assert len(observed) == 2
+
+
+def test_non_transient_errors_are_raised_at_once(observed):
+    calls = []
+
+    async def click():
+        calls.append(1)
+        raise PageError("Element not found")
+
+    with pytest.raises(PageError, match="Element not found"):
+        asyncio.run(politeness.retry(click, attempts=3, base_delay=0))
+
+    assert len(calls) == 1
+    assert observed == []
@@ -0,0 +1,21 @@
+import asyncio
+import io
+import sys
+
+from utils import pretty_print
+
+
+def test_batched_lines_keep_arrival_order_across_streams(monkeypatch):
+    shared = io.StringIO()
+    monkeypatch.setattr(sys, "stdout", shared)
+    monkeypatch.setattr(sys, "stderr", shared)
+
+    async def log():
+        pretty_print.display_info("a")
+        pretty_print.display_error("b")
+        pretty_print.display_info("c")
+        await asyncio.sleep(pretty_print._FLUSH_SEC * 3)
+
+    asyncio.run(log())
+    lines = shared.getvalue().splitlines()
+    assert [line.split(": ", 1)[1] for line in lines] == ["a", "b", "c"]
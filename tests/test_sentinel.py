@@ -0,0 +1,66 @@
+import pytest
+
+from utils import sentinel
+
+
+def test_playwright_network_errors_are_transient():
+    assert sentinel.is_transient("Page.goto: net::ERR_CONNECTION_RESET at https://x")
+    assert sentinel.is_transient("Page.goto: net::ERR_NAME_NOT_RESOLVED")
+
+
+def test_timeouts_and_rate_limits_are_transient():
+    assert sentinel.is_transient("Timeout 30000ms exceeded.")
+    assert sentinel.is_transient("HTTP 429 Too Many Requests")
+
+
+def test_other_errors_are_not_transient():
+    assert not sentinel.is_transient("Element not found")
+    assert not sentinel.is_transient("")
+
+
+class _Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock(1000.0)
+    monkeypatch.setattr(sentinel, "time", clock)
+    monkeypatch.setattr(sentinel, "_buckets", [0] * sentinel._WINDOW_SEC)
+    monkeypatch.setattr(sentinel, "_bucket_sum", 0)
+    monkeypatch.setattr(sentinel, "_last_sec", 1000)
+    return clock
+
+
+def test_extra_delay_follows_hits_in_the_last_minute(clock):
+    for _ in range(3):
+        sentinel._record_hit()
+    assert sentinel.recommend_extra_delay() == 5.0
+
+    clock.now += 30
+    sentinel._record_hit()
+    sentinel._record_hit()
+    assert sentinel.recommend_extra_delay() == 10.0
+
+    # The first three hits age out; the two recent ones remain.
+    clock.now += 31
+    assert sentinel.recommend_extra_delay() == 0.0
+    assert sentinel._bucket_sum == 2
+
+    clock.now += 30
+    assert sentinel._bucket_sum == 2
+    assert sentinel.recommend_extra_delay() == 0.0
+    assert sentinel._bucket_sum == 0
+
+
+def test_long_idle_gap_clears_the_window(clock):
+    for _ in range(5):
+        sentinel._record_hit()
+    clock.now += 10 * sentinel._WINDOW_SEC
+    assert sentinel.recommend_extra_delay() == 0.0
+    sentinel._record_hit()
+    assert sentinel._bucket_sum == 1
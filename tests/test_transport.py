@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from utils import transport
+from utils.transport import KM_LADDER, TransportCaps, _Candidate, _rank
+
+
+def _caps(max_km=10.0, max_pct=20.0, min_free=1):
+    return TransportCaps(
+        max_km=max_km,
+        max_pct=max_pct,
+        min_free=min_free,
+        ttl_s=2700,
+        km_ladder=tuple(max_km * m for m in KM_LADDER),
+    )
+
+
+def _filter_and_min(candidates, caps):
+    """The selection _pick_destination replaced: filter per rung, then min()."""
+
+    def has_room(c):
+        return c.free is None or c.free >= caps.min_free
+
+    strict = [
+        c
+        for c in candidates
+        if c.km <= caps.max_km and c.pct <= caps.max_pct and has_room(c)
+    ]
+    if strict:
+        return min(strict, key=_rank), 0
+    for r, km_limit in enumerate(caps.km_ladder[1:], start=1):
+        widened = [c for c in candidates if c.km <= km_limit and has_room(c)]
+        if widened:
+            return min(widened, key=_rank), r
+    return None
+
+
+def test_strict_fit_wins_over_cheaper_wider_rows():
+    near = _Candidate(15.0, 9.0, 2, 0, "near")
+    far_cheap = _Candidate(0.0, 11.0, 2, 1, "far")
+    assert transport._pick_destination([far_cheap, near], _caps()) == (near, 0)
+
+
+def test_ladder_uses_first_non_empty_rung():
+    taxed = _Candidate(50.0, 5.0, 2, 0, "taxed")
+    widest = _Candidate(0.0, 19.0, 2, 1, "widest")
+    assert transport._pick_destination([widest, taxed], _caps()) == (taxed, 1)
+    assert transport._pick_destination([widest], _caps()) == (widest, 3)
+
+
+def test_full_rows_and_out_of_range_rows_are_skipped():
+    full = _Candidate(0.0, 1.0, 0, 0, "full")
+    too_far = _Candidate(0.0, 25.0, None, 1, "too far")
+    assert transport._pick_destination([full, too_far], _caps()) is None
+
+
+def test_matches_filter_and_min_on_random_candidates():
+    rng = random.Random(4321)
+    for _ in range(3000):
+        caps = _caps(max_km=rng.choice((5.0, 10.0, 25.0)), max_pct=rng.choice((0, 20)))
+        candidates = [
+            _Candidate(
+                float(rng.choice((0, 10, 20, 30, 50))),
+                round(rng.uniform(0, caps.max_km * 2.5), 1),
+                rng.choice((None, 0, 1, 3)),
+                i,
+                f"row {i}",
+            )
+            for i in range(rng.randint(0, 12))
+        ]
+        assert transport._pick_destination(candidates, caps) == _filter_and_min(
+            candidates, caps
+        )
@@ -8,6 +8,7 @@
 
 from __future__ import annotations
 import json, random, time, math, os, re
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 from utils.pretty_print import display_info, display_error
@@ -67,6 +68,10 @@ DEFAULT_SOFT_CAPS = {
     "arff": int(os.getenv("MCX_SOFTCAP_ARFF", "1")),
 }
 
+# Vehicle rows on a mission page: the rows holding the vehicle checkboxes that
+# _fetch_vehicle_rows reads (eta_filter falls back to a broad scan if none match)
+MISSION_VEHICLE_ROWS = 'tr:has(input[type=checkbox][name*="vehicle"])'
+
 # Distance bands (km)
 BANDS = [(0.0, 10.0), (10.0, 20.0), (20.0, 40.0)]
 
@@ -94,6 +99,7 @@ def _save_json(p: Path, d: dict[str, Any]) -> None:
         display_error(f"Could not save {p.name}: {e}")
 
 
+@lru_cache(maxsize=4096)
 def _priority_score(name: str) -> int:
     """Option #3: score by mission value/size using keywords in the title."""
     n = (name or "").lower()
@@ -116,6 +122,11 @@ def _priority_score(name: str) -> int:
     return score
 
 
+def _priority_scores(names: list[str]) -> list[int]:
+    """Score a batch of mission titles; repeated titles hit the cache."""
+    return [_priority_score(n) for n in names]
+
+
 def _classify_type(text: str) -> str | None:
     t = (text or "").lower()
     for typ, pat in _TYPE_PATTERNS.items():
@@ -313,16 +324,18 @@ def _soft_prioritize(
     items: list[tuple[str, str, dict[str, Any]]],
 ) -> list[tuple[str, str, dict[str, Any]]]:
     # Items contain (title, mission_id, data). Use keyword score + age as tiebreaker.
-    def score(title: str, seen_ts: int) -> int:
-        s = _priority_score(title)
-        age_bonus = min(
-            10, int((int(time.time()) - seen_ts) / 60)
-        )  # +1 per minute, cap 10
+    now = int(time.time())
+    scores = _priority_scores([title for title, _, _ in items])
+
+    def score(s: int, seen_ts: int) -> int:
+        age_bonus = min(10, int((now - seen_ts) / 60))  # +1 per minute, cap 10
         return s * 10 + age_bonus
 
-    return sorted(
-        items, key=lambda x: -score(x[0], int(x[2].get("seen_ts", int(time.time()))))
+    ranked = sorted(
+        zip(scores, items),
+        key=lambda x: -score(x[0], int(x[1][2].get("seen_ts", now))),
     )
+    return [item for _, item in ranked]
 
 
 async def _record_cooldowns(picked_ids: list[str]) -> None:
@@ -625,7 +638,7 @@ async def navigate_and_dispatch(browsers):
 
             # Check eligibility (generic gate)
             eligible = await count_vehicles_within_limits(
-                page, max_minutes, max_km, stop_at=1
+                page, max_minutes, max_km, stop_at=1, row_selector=MISSION_VEHICLE_ROWS
             )
             if eligible < 1:
                 await emit(
@@ -639,7 +652,11 @@ async def navigate_and_dispatch(browsers):
 
             # First pass selection (generic)
             base_selected = await select_vehicles_within_limits(
-                page, max_minutes, max_km, max_pick=max_pick
+                page,
+                max_minutes,
+                max_km,
+                max_pick=max_pick,
+                row_selector=MISSION_VEHICLE_ROWS,
             )
 
             # Requirements-aware finishing (Options #1, #17, #18)
@@ -14,7 +14,6 @@ _TIME_RE = re.compile(
 )
 _KM_RE = re.compile(r"([\d\.,]+)\s*km", re.I)
 _M_RE = re.compile(r"([\d\.,]+)\s*m(?![a-z])", re.I)
-_PCT_RE = re.compile(r"(\d+)\s*%")
 _FREE_RE = re.compile(r"(free|available)\s*[:\-]?\s*(\d+)", re.I)
 _BEDS_RE = re.compile(r"beds?\s*[:\-]?\s*(\d+)\s*/\s*(\d+)", re.I)
 _CELLS_RE = re.compile(r"cells?\s*[:\-]?\s*(\d+)\s*/\s*(\d+)", re.I)
@@ -39,6 +38,8 @@ def parse_seconds(text: str) -> int:
 
 def parse_km(text: str) -> float:
     text = text or ""
+    if "m" not in text and "M" not in text:  # both "km" and "m" need one
+        return math.inf
     match = _KM_RE.search(text)
     if match:
         return _to_float(match.group(1))
@@ -49,8 +50,20 @@ def parse_km(text: str) -> float:
 
 
 def parse_pct(text: str) -> float:
-    match = _PCT_RE.search(text or "")
-    return float(match.group(1)) if match else math.inf
+    """Return the first ``<digits> %`` value in ``text`` or ``inf``."""
+    text = text or ""
+    i = text.find("%")
+    while i >= 0:
+        end = i
+        while end > 0 and text[end - 1].isspace():
+            end -= 1
+        start = end
+        while start > 0 and text[start - 1].isdecimal():
+            start -= 1
+        if start < end:
+            return float(text[start:end])
+        i = text.find("%", i + 1)
+    return math.inf
 
 
 def parse_capacity(text: str):
@@ -70,51 +83,88 @@ def parse_capacity(text: str):
     return (None, None)
 
 
-async def count_vehicles_within_limits(
-    page, max_minutes: int, max_km: float, stop_at: int = 1
-) -> int:
-    rows = page.locator("li, tr, div")
-    n = min(await rows.count(), 400)
-    good = 0
-    for i in range(n):
-        r = rows.nth(i)
-        try:
-            text = (await r.inner_text()).strip()
-            eta_sec = parse_seconds(text)
-            dist_km = parse_km(text)
-            too_far = (eta_sec and eta_sec > max_minutes * 60) or (
-                dist_km and dist_km > max_km
-            )
-            if too_far:
-                continue
-            good += 1
-            if good >= stop_at:
-                break
-        except Exception:
+def parse_all(text: str) -> tuple[float, float, int | None]:
+    """Return ``(km, pct, free)`` for a destination row.
+
+    The individual parsers are used deliberately: in CPython one alternation
+    regex over the row is slower than these three prefiltered scans.
+    """
+    text = text or ""
+    return parse_km(text), parse_pct(text), parse_capacity(text)[0]
+
+
+# Vehicle list rows.  The broad selector matches nearly every block element
+# and is only used when the specific one finds nothing.
+VEHICLE_ROW_SELECTOR = 'tr[id^="vehicle_row"], li.vehicle_checkbox'
+_BROAD_ROW_SELECTOR = "li, tr, div"
+# Upper bound on rows scanned per page; the broad row selector can match a lot.
+_ROW_LIMIT = 400
+
+
+async def _row_texts(rows) -> list[str]:
+    """Fetch the text of the first ``_ROW_LIMIT`` rows in one round-trip."""
+    try:
+        return await rows.evaluate_all(
+            "(els, n) => els.slice(0, n).map(e => e.innerText || '')", _ROW_LIMIT
+        )
+    except Exception:
+        return []
+
+
+async def _scan_rows(page, row_selector: str):
+    """Return ``(rows, texts)`` for ``row_selector`` or the broad fallback."""
+    rows = page.locator(row_selector)
+    texts = await _row_texts(rows)
+    if not texts and row_selector != _BROAD_ROW_SELECTOR:
+        rows = page.locator(_BROAD_ROW_SELECTOR)
+        texts = await _row_texts(rows)
+    return rows, texts
+
+
+def _rows_within_limits(
+    texts: list[str], max_minutes: int, max_km: float, stop_at: int | None = None
+) -> list[int]:
+    """Return indices of rows whose ETA and distance are within the limits."""
+    max_sec = max_minutes * 60
+    good: list[int] = []
+    for i, text in enumerate(texts):
+        text = (text or "").strip()
+        eta_sec = parse_seconds(text)
+        dist_km = parse_km(text)
+        too_far = (eta_sec and eta_sec > max_sec) or (dist_km and dist_km > max_km)
+        if too_far:
             continue
+        good.append(i)
+        if stop_at is not None and len(good) >= stop_at:
+            break
     return good
 
 
+async def count_vehicles_within_limits(
+    page,
+    max_minutes: int,
+    max_km: float,
+    stop_at: int = 1,
+    row_selector: str = VEHICLE_ROW_SELECTOR,
+) -> int:
+    _, texts = await _scan_rows(page, row_selector)
+    return len(_rows_within_limits(texts, max_minutes, max_km, stop_at))
+
+
 async def select_vehicles_within_limits(
-    page, max_minutes: int, max_km: float, max_pick: int = 6
+    page,
+    max_minutes: int,
+    max_km: float,
+    max_pick: int = 6,
+    row_selector: str = VEHICLE_ROW_SELECTOR,
 ) -> int:
-    rows = page.locator("li, tr, div")
-    n = min(await rows.count(), 400)
+    rows, texts = await _scan_rows(page, row_selector)
     picked = 0
-    for i in range(n):
+    for i in _rows_within_limits(texts, max_minutes, max_km):
         if picked >= max_pick:
             break
-        r = rows.nth(i)
         try:
-            text = (await r.inner_text()).strip()
-            eta_sec = parse_seconds(text)
-            dist_km = parse_km(text)
-            too_far = (eta_sec and eta_sec > max_minutes * 60) or (
-                dist_km and dist_km > max_km
-            )
-            if too_far:
-                continue
-            ctl = r.locator(
+            ctl = rows.nth(i).locator(
                 "input[type=checkbox], input[type=radio], button.select, a.select"
             )
             if await ctl.count() == 0:
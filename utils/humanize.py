@@ -17,18 +17,15 @@ def _parse_range(s: str, default=(0.5, 1.5)):
         return default
 
 
-def _in_quiet(hours: str) -> bool:
-    """Return True if the current time is within ``hours`` ("HH:MM-HH:MM")."""
+def _parse_quiet(hours: str) -> tuple[int, int] | None:
+    """Parse ``hours`` ("HH:MM-HH:MM") into (start, end) minutes of the day."""
     try:
         start, end = hours.split("-")
         sh, sm = map(int, start.split(":"))
         eh, em = map(int, end.split(":"))
-        now = dt.datetime.now().time()
-        st = dt.time(sh, sm)
-        en = dt.time(eh, em)
-        return (st <= en and st <= now <= en) or (st > en and (now >= st or now <= en))
+        return (sh * 60 + sm, eh * 60 + em)
     except Exception:
-        return False
+        return None
 
 
 async def gentle_mouse(page):
@@ -66,6 +63,7 @@ class Humanizer:
         self.dwell_mean = (dwell_lo + dwell_hi) / 2
         self.dwell_sigma = max(0.05, (dwell_hi - dwell_lo) / 4)
         self.quiet_hours = cfg.get("quiet_hours", "02:00-06:30")
+        self._quiet = _parse_quiet(self.quiet_hours)
         self.quiet_mult = float(cfg.get("quiet_mult", 2.0))
         self.break_profiles = [
             (
@@ -82,6 +80,17 @@ class Humanizer:
             ),
         ]
 
+    def _in_quiet(self) -> bool:
+        """Return True if the current time is within the quiet hours."""
+        if self._quiet is None:
+            return False
+        start, end = self._quiet
+        now = dt.datetime.now()
+        m = now.hour * 60 + now.minute
+        if start <= end:
+            return start <= m <= end
+        return m >= start or m <= end
+
     def _gauss(self, mean: float, sigma: float) -> float:
         return max(0.05, random.gauss(mean, sigma))
 
@@ -95,7 +104,7 @@ class Humanizer:
 
     async def maybe_break(self) -> None:
         """Occasionally take short, medium, or long breaks with fatigue bias."""
-        multiplier = self.quiet_mult if _in_quiet(self.quiet_hours) else 1.0
+        multiplier = self.quiet_mult if self._in_quiet() else 1.0
         fatigue = 1 + self.actions * 0.05
         for prob, rng in self.break_profiles:
             if random.random() < prob * multiplier * fatigue:
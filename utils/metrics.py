@@ -5,7 +5,9 @@
 from __future__ import annotations
 
 import json
+import threading
 import time
+from collections import defaultdict
 from pathlib import Path
 from typing import Any
 
@@ -33,20 +35,57 @@ _COUNTERS: dict[str, int] = {
 _LAST_WRITE_TS = 0
 _LAST_HEARTBEAT_TS = 0
 
+# Counters are bumped from the event loop; persistence and heartbeat run on a
+# daemon thread so JSON encoding and disk writes never stall async tasks.
+_LOCK = threading.Lock()  # guards _COUNTERS and _PENDING
+_IO_LOCK = threading.Lock()  # serialises writes/heartbeats
+_WAKE = threading.Event()
+_WRITER: threading.Thread | None = None
+_DIRTY = False  # counters changed since the last write
+# Increments since the last merge.  They are folded into _COUNTERS when
+# metrics are flushed or snapshotted, which keeps inc() to one dict bump.
+_PENDING: defaultdict[str, int] = defaultdict(int)
+
+
+def _ensure_writer() -> None:
+    global _WRITER
+    if _WRITER is None:
+        _WRITER = threading.Thread(
+            target=_writer_loop, name="metrics-writer", daemon=True
+        )
+        _WRITER.start()
+
 
 def inc(name: str, n: int = 1) -> None:
-    global _COUNTERS
-    _COUNTERS[name] = int(_COUNTERS.get(name, 0)) + int(n)
+    with _LOCK:
+        _PENDING[name] += n
+    _ensure_writer()
+
+
+def _merge_pending() -> None:
+    """Fold pending increments into the counters; caller holds ``_LOCK``."""
+    global _DIRTY
+    if not _PENDING:
+        return
+    for k, v in _PENDING.items():
+        _COUNTERS[k] = _COUNTERS.get(k, 0) + v
+    _PENDING.clear()
     _COUNTERS["updated"] = int(time.time())
+    _DIRTY = True
 
 
 def snapshot() -> dict[str, Any]:
-    s = dict(_COUNTERS)
+    with _LOCK:
+        _merge_pending()
+        s = dict(_COUNTERS)
     s["updated"] = int(time.time())
     return s
 
 
 def _write_now() -> None:
+    global _DIRTY
+    with _LOCK:
+        _DIRTY = False
     METRICS_PATH.parent.mkdir(parents=True, exist_ok=True)
     METRICS_PATH.write_text(
         json.dumps(snapshot(), ensure_ascii=False, indent=2),
@@ -54,26 +93,53 @@ def _write_now() -> None:
     )
 
 
+def _mark_dirty() -> None:
+    global _DIRTY
+    with _LOCK:
+        _DIRTY = True
+
+
+def _flush(force: bool = False) -> None:
+    """Persist metrics and print a heartbeat when their intervals have elapsed."""
+    global _LAST_WRITE_TS, _LAST_HEARTBEAT_TS
+    with _IO_LOCK:
+        with _LOCK:
+            _merge_pending()
+        now = int(time.time())
+
+        if force or (_DIRTY and (now - _LAST_WRITE_TS) >= WRITE_INTERVAL_SEC):
+            try:
+                _write_now()
+                _LAST_WRITE_TS = now
+            except Exception as e:
+                _mark_dirty()
+                display_error(f"metrics write failed: {e}")
+
+        if (now - _LAST_HEARTBEAT_TS) >= HEARTBEAT_INTERVAL_SEC:
+            s = snapshot()
+            display_info(
+                f"[hb] missions {s.get('missions_seen',0)}/{s.get('missions_dispatched',0)}/{s.get('missions_deferred',0)} "
+                f"| transports {s.get('transports_seen',0)}/{s.get('transports_completed',0)}/{s.get('transports_deferred',0)} "
+                f"| reauths={s.get('reauths',0)} rl={s.get('rate_limit_hits',0)} to={s.get('timeouts',0)} err={s.get('errors',0)}"
+            )
+            _LAST_HEARTBEAT_TS = now
+
+
+def _writer_loop() -> None:
+    while True:
+        _WAKE.wait(WRITE_INTERVAL_SEC)
+        _WAKE.clear()
+        _flush()
+
+
 def maybe_write(force: bool = False) -> None:
     """
     Persist metrics ~once a minute and print a heartbeat every ~90 seconds.
-    Safe to call frequently from loops.
+    Safe to call frequently from loops: the work happens on a background
+    thread, this only nudges it. ``force=True`` writes synchronously.
     """
-    global _LAST_WRITE_TS, _LAST_HEARTBEAT_TS
-    now = int(time.time())
-
-    if force or (now - _LAST_WRITE_TS) >= WRITE_INTERVAL_SEC:
-        try:
-            _write_now()
-            _LAST_WRITE_TS = now
-        except Exception as e:
-            display_error(f"metrics write failed: {e}")
-
-    if (now - _LAST_HEARTBEAT_TS) >= HEARTBEAT_INTERVAL_SEC:
-        s = snapshot()
-        display_info(
-            f"[hb] missions {s.get('missions_seen',0)}/{s.get('missions_dispatched',0)}/{s.get('missions_deferred',0)} "
-            f"| transports {s.get('transports_seen',0)}/{s.get('transports_completed',0)}/{s.get('transports_deferred',0)} "
-            f"| reauths={s.get('reauths',0)} rl={s.get('rate_limit_hits',0)} to={s.get('timeouts',0)} err={s.get('errors',0)}"
-        )
-        _LAST_HEARTBEAT_TS = now
+    if force:
+        _flush(force=True)
+        return
+    _ensure_writer()
+    _WAKE.set()
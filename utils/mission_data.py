@@ -6,6 +6,7 @@
 from __future__ import annotations
 
 import json
+import os
 import re
 import time
 from pathlib import Path
@@ -18,14 +19,65 @@ SNAPSHOT_PATH = Path("data/mission_data.json")
 MISSION_HREF_RE = re.compile(r"/missions/(\d+)")
 
 
-def _read_existing() -> dict[str, Any]:
+# Last snapshot read from or written to disk.  It is keyed by the file's stat
+# so an external rewrite or deletion (e.g. by the cache-clear agent) forces a
+# fresh read instead of comparing against stale data.
+_PREV: dict[str, Any] | None = None
+_PREV_STAT: tuple[int, int] | None = None
+
+
+def _stat_key() -> tuple[int, int] | None:
     try:
-        if SNAPSHOT_PATH.exists():
+        st = SNAPSHOT_PATH.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _read_existing() -> dict[str, Any]:
+    global _PREV, _PREV_STAT
+    key = _stat_key()
+    if _PREV is not None and key == _PREV_STAT:
+        return _PREV
+    data: dict[str, Any] = {}
+    if key is not None:
+        try:
             with SNAPSHOT_PATH.open("r", encoding="utf-8") as f:
-                return json.load(f) or {}
-    except Exception:
-        pass
-    return {}
+                data = json.load(f) or {}
+        except Exception:
+            data = {}
+    _PREV, _PREV_STAT = data, key
+    return data
+
+
+def _copy_snapshot(snapshot: dict[str, Any]) -> dict[str, Any]:
+    """Copy ``snapshot`` per record so merging never touches the cached one."""
+    return {k: dict(v) if isinstance(v, dict) else v for k, v in snapshot.items()}
+
+
+def _write_atomic(snapshot: dict[str, Any]) -> None:
+    """Write ``snapshot`` atomically so readers never see a partial file."""
+    global _PREV, _PREV_STAT
+    SNAPSHOT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = SNAPSHOT_PATH.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, SNAPSHOT_PATH)
+    _PREV, _PREV_STAT = _copy_snapshot(snapshot), _stat_key()
+
+
+def _merge_seen_ts(prior: dict[str, Any] | None, rec: dict[str, Any], now: int) -> None:
+    """Set ``rec["seen_ts"]`` to the earliest valid value of ``prior`` and ``rec``."""
+    # Timestamps are always written as ints; anything else counts as missing.
+    curr = rec.get("seen_ts")
+    if not (isinstance(curr, int) and 0 < curr <= now):
+        curr = now
+    prior_seen = prior.get("seen_ts") if prior else None
+    if isinstance(prior_seen, int) and 0 < prior_seen <= now:
+        curr = min(prior_seen, curr)
+    rec["seen_ts"] = curr
 
 
 def _merge_preserving_seen_ts(snapshot: dict[str, Any]) -> dict[str, Any]:
@@ -36,25 +88,7 @@ def _merge_preserving_seen_ts(snapshot: dict[str, Any]) -> dict[str, Any]:
     now = int(time.time())
 
     for mid, rec in snapshot.items():
-        prior = prev.get(mid) or {}
-        try:
-            prior_seen = int(prior.get("seen_ts") or 0)
-        except Exception:
-            prior_seen = 0
-
-        curr_seen = rec.get("seen_ts")
-        try:
-            curr_seen = int(curr_seen) if curr_seen is not None else 0
-        except Exception:
-            curr_seen = 0
-
-        if curr_seen <= 0 or curr_seen > now:
-            curr_seen = now
-
-        if prior_seen > 0 and prior_seen <= now:
-            rec["seen_ts"] = min(prior_seen, curr_seen)
-        else:
-            rec["seen_ts"] = curr_seen
+        _merge_seen_ts(prev.get(mid), rec, now)
 
     return snapshot
 
@@ -65,23 +99,11 @@ def write_snapshot(snapshot: dict[str, Any]) -> None:
     If nothing changed since last write, skip the write to reduce churn.
     """
     snapshot = _merge_preserving_seen_ts(snapshot)
-
-    # Skip write if unchanged
-    prev = _read_existing()
-    try:
-        unchanged = json.dumps(prev, sort_keys=True) == json.dumps(
-            snapshot, sort_keys=True
-        )
-    except Exception:
-        unchanged = False
-
-    if unchanged:
+    if snapshot == _read_existing():
         display_info("mission snapshot: unchanged; skipped write.")
         return
 
-    SNAPSHOT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with SNAPSHOT_PATH.open("w", encoding="utf-8") as f:
-        json.dump(snapshot, f, ensure_ascii=False, indent=2)
+    _write_atomic(snapshot)
     display_info(f"Wrote mission_data.json with {len(snapshot)} missions.")
 
 
@@ -97,28 +119,23 @@ async def _collect_from_page(page) -> dict[str, Any]:
         return {}
 
     anchors = page.locator('a[href^="/missions/"]')
-    count = await anchors.count()
+    try:
+        # One round-trip for every anchor's href and caption.
+        pairs = await anchors.evaluate_all(
+            "els => els.map(a => [a.getAttribute('href') || '',"
+            " (a.innerText || '').trim()])"
+        )
+    except Exception as e:
+        display_error(f"mission snapshot: reading missions failed: {e}")
+        return {}
     snapshot: dict[str, Any] = {}
     now = int(time.time())
 
-    for i in range(count):
-        try:
-            a = anchors.nth(i)
-            href = (await a.get_attribute("href")) or ""
-            m = MISSION_HREF_RE.search(href)
-            if not m:
-                continue
-            mid = m.group(1)
-            try:
-                title = (await a.inner_text()).strip()
-            except Exception:
-                title = "Dispatch"
-            if not title:
-                title = "Dispatch"
-
-            snapshot[mid] = {"mission_name": title, "seen_ts": now}
-        except Exception:
+    for href, title in pairs:
+        m = MISSION_HREF_RE.search(href or "")
+        if not m:
             continue
+        snapshot[m.group(1)] = {"mission_name": title or "Dispatch", "seen_ts": now}
 
     return snapshot
 
@@ -152,7 +169,7 @@ async def check_and_grab_missions(*args, **kwargs) -> None:
             display_info(
                 "mission snapshot: no missions found on page; preserving existing snapshot."
             )
-            collected = _read_existing()
+            collected = _copy_snapshot(_read_existing())
         try:
             write_snapshot(collected)
         except Exception as e:
@@ -161,13 +178,11 @@ async def check_and_grab_missions(*args, **kwargs) -> None:
 
     # Fallback: preserve existing (or write empty) if no page available
     try:
-        existing = _read_existing()
+        existing = _copy_snapshot(_read_existing())
         if existing:
             write_snapshot(existing)
         else:
-            SNAPSHOT_PATH.parent.mkdir(parents=True, exist_ok=True)
-            with SNAPSHOT_PATH.open("w", encoding="utf-8") as f:
-                json.dump({}, f, ensure_ascii=False, indent=2)
+            _write_atomic({})
             display_info("Wrote mission_data.json with 0 missions.")
     except Exception as e:
         display_error(f"mission snapshot fallback failed: {e}")
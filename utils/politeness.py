@@ -13,15 +13,65 @@ from __future__ import annotations
 
 import asyncio
 import random
+import threading
 import time
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from functools import partial
 from typing import Any
 from collections.abc import Awaitable, Callable
 
-from data.config_settings import get_page_min_dwell_range
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from data.config_settings import get_page_min_dwell_range, get_politeness, on_reload
+from utils import sentinel
 from utils.auth_repair import ensure_authenticated
 from utils.backoff import get_delay_factor, record_good, record_timeout
+from utils.pretty_print import display_error
+
+# Errors worth retrying.  Anything else (missing selector, closed target, auth
+# redirect) fails fast unless its message looks like a rate limit or timeout.
+_RECOVERABLE = (PlaywrightTimeoutError, asyncio.TimeoutError, ConnectionError, OSError)
+
+
+@dataclass(frozen=True)
+class PolitenessCfg:
+    """Snapshot of the ``[politeness]`` settings read by the wrappers."""
+
+    retry_max_delay: float
+    retry_attempts: int
+    retry_base_delay: float
+    gate_entry_base: float
+    gate_entry_spread: float
+    gate_exit_base: float
+    gate_exit_spread: float
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> PolitenessCfg:
+        return cls(
+            retry_max_delay=float(d["retry_max_delay"]),
+            retry_attempts=int(d["retry_attempts"]),
+            retry_base_delay=float(d["retry_base_delay"]),
+            gate_entry_base=float(d["gate_entry_base"]),
+            gate_entry_spread=float(d["gate_entry_spread"]),
+            gate_exit_base=float(d["gate_exit_base"]),
+            gate_exit_spread=float(d["gate_exit_spread"]),
+        )
+
+
+_CFG = PolitenessCfg.from_dict(get_politeness())
+_CFG_LOCK = threading.Lock()
+
+
+@on_reload
+def reload_politeness() -> None:
+    """Rebuild the settings snapshot; runs after ``reload_config()``."""
+    global _CFG
+    with _CFG_LOCK:
+        _CFG = PolitenessCfg.from_dict(get_politeness())
+
 
+# Sized once by Main via set_max_concurrency() before any task enters it.
 _site_gate = asyncio.Semaphore(2)
 
 
@@ -40,77 +90,127 @@ async def sleep_jitter(base: float = 0.5, spread: float = 0.5) -> None:
 @asynccontextmanager
 async def site_gate():
     """Limit concurrent site interactions and add a small entry/exit delay."""
+    cfg = _CFG
     async with _site_gate:
-        await sleep_jitter(0.15, 0.35)
+        await sleep_jitter(cfg.gate_entry_base, cfg.gate_entry_spread)
         try:
             yield
         finally:
-            await sleep_jitter(0.10, 0.25)
-
-
-async def retry(
-    coro_fn: Callable[[], Awaitable[Any]], attempts: int = 3, base_delay: float = 0.4
-) -> Any:
-    """Retry ``coro_fn`` with exponential backoff.
-
-    ``record_good``/``record_timeout`` integrate with the adaptive backoff
-    system so repeated timeouts will slow subsequent requests.  The function
-    returns the result of ``coro_fn`` on success or raises the last
-    encountered exception once attempts are exhausted.
-    """
+            await sleep_jitter(cfg.gate_exit_base, cfg.gate_exit_spread)
+
+
+async def _retry_counted(
+    coro_fn: Callable[[], Awaitable[Any]],
+    attempts: int | None = None,
+    base_delay: float | None = None,
+) -> tuple[Any, int]:
+    """Like :func:`retry` but also return how many attempts were used."""
+    cfg = _CFG
+    attempts = cfg.retry_attempts if attempts is None else attempts
+    base_delay = cfg.retry_base_delay if base_delay is None else base_delay
+    cap = cfg.retry_max_delay
+    delay = base_delay
     last_exc: Exception | None = None
     for i in range(attempts):
         try:
             res = await coro_fn()
             record_good()
-            return res
-        except Exception as e:  # noqa: BLE001 - we want to bubble up original
+            return res, i + 1
+        except Exception as e:
+            msg = str(e)
+            if not isinstance(e, _RECOVERABLE) and not sentinel.is_transient(msg):
+                raise  # bad selector, closed page, ...: retrying won't help
             last_exc = e
             record_timeout()
-        await asyncio.sleep((base_delay * (2**i)) + random.random() * 0.3)
+            # Whatever is finally raised is reported by the caller; only the
+            # attempts swallowed here are fed to the sentinel.
+            if i + 1 < attempts:
+                sentinel.observe_error(msg)
+        if i + 1 < attempts:
+            # Decorrelated jitter: bounded, and concurrent callers drift apart
+            delay = min(cap, random.uniform(base_delay, delay * 3))
+            await asyncio.sleep(delay)
+    fn = getattr(coro_fn, "func", coro_fn)  # unwrap functools.partial
+    name = getattr(fn, "__qualname__", repr(fn))
+    display_error(f"{name} failed after {attempts} attempts: {last_exc}")
     raise last_exc  # type: ignore[misc]
 
 
+async def retry(
+    coro_fn: Callable[[], Awaitable[Any]],
+    attempts: int | None = None,
+    base_delay: float | None = None,
+) -> Any:
+    """Retry ``coro_fn`` with capped, decorrelated-jitter backoff.
+
+    ``attempts`` and ``base_delay`` default to the ``[politeness]`` config.
+
+    ``record_good``/``record_timeout`` integrate with the adaptive backoff
+    system so repeated timeouts will slow subsequent requests.  Only
+    recoverable errors (timeouts, network failures, rate limits) are retried;
+    anything else is raised immediately.  The function returns the result of
+    ``coro_fn`` on success or raises the last encountered exception once
+    attempts are exhausted.
+    """
+    res, _ = await _retry_counted(coro_fn, attempts, base_delay)
+    return res
+
+
+def _should_jitter(tries: int) -> bool:
+    """Trailing jitter is only needed after a retry or while backed off."""
+    return tries > 1 or get_delay_factor() > 1.0
+
+
 async def goto_safe(page, url: str, **kwargs):
     """Navigate to ``url`` with retries and polite gating."""
     async with site_gate():
-        result = await retry(lambda: page.goto(url, **kwargs))
+        result, tries = await _retry_counted(partial(page.goto, url, **kwargs))
         if "users/sign_in" in (page.url or ""):
             if await ensure_authenticated(page):
-                result = await retry(lambda: page.goto(url, **kwargs))
+                result, more = await _retry_counted(partial(page.goto, url, **kwargs))
+                tries += more
         await page.wait_for_load_state("networkidle")
-        await sleep_jitter(0.3, 0.5)
+        if _should_jitter(tries):
+            await sleep_jitter(0.3, 0.5)
         return result
 
 
 async def click_safe(page, selector: str, **kwargs):
     """Click ``selector`` after waiting for it to be visible."""
     async with site_gate():
-        await retry(
-            lambda: page.wait_for_selector(selector, state="visible", timeout=12000)
+        _, waits = await _retry_counted(
+            partial(page.wait_for_selector, selector, state="visible", timeout=12000)
         )
-        result = await retry(lambda: page.click(selector, **kwargs))
-        await sleep_jitter(0.15, 0.35)
+        result, tries = await _retry_counted(partial(page.click, selector, **kwargs))
+        if _should_jitter(max(waits, tries)):
+            await sleep_jitter(0.15, 0.35)
         return result
 
 
 async def fill_safe(page, selector: str, text: str):
     """Fill ``selector`` with ``text`` in a polite manner."""
     async with site_gate():
-        await retry(
-            lambda: page.wait_for_selector(selector, state="visible", timeout=12000)
+        _, waits = await _retry_counted(
+            partial(page.wait_for_selector, selector, state="visible", timeout=12000)
         )
-        result = await retry(lambda: page.fill(selector, text))
-        await sleep_jitter(0.08, 0.25)
+        result, tries = await _retry_counted(partial(page.fill, selector, text))
+        if _should_jitter(max(waits, tries)):
+            await sleep_jitter(0.08, 0.25)
         return result
 
 
-async def ensure_settled(page, selector: str | None = None) -> None:
-    """Wait for ``page`` to reach ``networkidle`` and dwell a minimum time."""
+async def ensure_settled(
+    page, selector: str | None = None, *, idle: bool = False
+) -> None:
+    """Wait for ``page`` to load and dwell a minimum time.
+
+    By default only ``domcontentloaded`` is awaited; pass ``idle=True`` where
+    the page fills itself in via XHR and ``networkidle`` is really needed.
+    """
     lo, hi = get_page_min_dwell_range()
     t0 = time.monotonic()
     try:
-        await page.wait_for_load_state("networkidle")
+        await page.wait_for_load_state("networkidle" if idle else "domcontentloaded")
         if selector:
             try:
                 await page.wait_for_selector(selector, state="visible", timeout=10000)
@@ -2,17 +2,79 @@
 # Maintained by: HGFantasy
 # License: MIT
 
+import asyncio
+import atexit
 import datetime as dt
 import sys
+import threading
+from collections import deque
+from itertools import groupby
+
+# Lines logged from inside the event loop are buffered and written in one
+# batch every _FLUSH_SEC instead of one flushed print per call.
+_FLUSH_SEC = 0.1
+_pending: deque = deque()
+_writer: asyncio.Task | None = None
+# _drain() also runs from threads without a loop (e.g. the metrics writer).
+_drain_lock = threading.RLock()
 
 
 def _ts():
     return dt.datetime.now().strftime("%H:%M:%S")
 
 
+def _drain() -> None:
+    with _drain_lock:
+        batch = []
+        while _pending:
+            batch.append(_pending.popleft())
+        # Keep arrival order: one write per run of lines for the same stream.
+        for is_err, run in groupby(batch, key=lambda item: item[0]):
+            stream = sys.stderr if is_err else sys.stdout
+            try:
+                stream.write("".join(line for _, line in run))
+                stream.flush()
+            except Exception:
+                pass
+
+
+async def _writer_loop() -> None:
+    global _writer
+    try:
+        while _pending:
+            await asyncio.sleep(_FLUSH_SEC)
+            _drain()
+    finally:
+        _drain()
+        _writer = None
+
+
+def _emit(is_err: bool, line: str) -> None:
+    global _writer
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if loop is None:
+        # No loop in this thread (startup, shutdown, worker threads): write
+        # straight through, after anything still queued to keep order.
+        with _drain_lock:
+            _drain()
+            stream = sys.stderr if is_err else sys.stdout
+            stream.write(line)
+            stream.flush()
+        return
+    _pending.append((is_err, line))
+    if _writer is None or _writer.get_loop() is not loop:
+        _writer = loop.create_task(_writer_loop())
+
+
 def display_info(msg: str):
-    print(f"[{_ts()}] INFO: {msg}", flush=True)
+    _emit(False, f"[{_ts()}] INFO: {msg}\n")
 
 
 def display_error(msg: str):
-    print(f"[{_ts()}] ERROR: {msg}", file=sys.stderr, flush=True)
+    _emit(True, f"[{_ts()}] ERROR: {msg}\n")
+
+
+atexit.register(_drain)
@@ -4,11 +4,36 @@
 import asyncio
 import os
 
+# How often a paused loop re-checks the PAUSE flag file (seconds).
+_PAUSE_POLL_SEC = 2
+
+_paused = False
+_stopped = False
+_resumed = asyncio.Event()  # set by refresh() once PAUSE is gone
+
+
+def refresh() -> None:
+    """Re-read the PAUSE/STOP flag files and wake paused loops on resume."""
+    global _paused, _stopped
+    _paused = os.path.exists("PAUSE")
+    _stopped = os.path.exists("STOP")
+    if not _paused:
+        _resumed.set()
+
 
 async def wait_if_paused():
-    while os.path.exists("PAUSE"):
-        await asyncio.sleep(2)
+    global _paused
+    _paused = os.path.exists("PAUSE")
+    while _paused:
+        _resumed.clear()
+        try:
+            await asyncio.wait_for(_resumed.wait(), _PAUSE_POLL_SEC)
+        except TimeoutError:
+            pass
+        _paused = os.path.exists("PAUSE")
 
 
 def should_stop() -> bool:
-    return os.path.exists("STOP")
+    global _stopped
+    _stopped = os.path.exists("STOP")
+    return _stopped
@@ -6,38 +6,67 @@ from __future__ import annotations
 
 import re
 import time
-from collections import deque
-from typing import Deque
 
 from utils.metrics import inc
 
-# Keep the last ~2 minutes of error timestamps
-_RATE_LIMITS: Deque[int] = deque(maxlen=64)
-_TIMEOUTS: Deque[int] = deque(maxlen=64)
+# Rate-limit/timeout hits over the last 60s, kept as one counter per second
+# of a ring plus a running total so lookups are O(1).
+_WINDOW_SEC = 60
+_buckets: list[int] = [0] * _WINDOW_SEC
+_bucket_sum = 0
+_last_sec = int(time.monotonic())
 
 # Simple classifiers (tweakable without breaking callers)
 _RE_RATE = re.compile(r"\b(429|too\s+many\s+requests|rate[-\s]?limit)\b", re.I)
-_RE_TO = re.compile(r"\b(timeout|timed\s*out|net::ERR_|ETIMEDOUT|TimeoutError)\b", re.I)
+# Chromium network failures (net::ERR_CONNECTION_RESET, ...) end in a word
+# character, so they sit outside the \b...\b group.
+_RE_TO = re.compile(
+    r"\b(timeout|timed\s*out|ETIMEDOUT|TimeoutError)\b|net::ERR_\w+", re.I
+)
+
+
+def _advance(now_sec: int) -> None:
+    """Zero buckets that fell out of the window since the last call."""
+    global _bucket_sum, _last_sec
+    elapsed = now_sec - _last_sec
+    if elapsed <= 0:
+        return
+    if elapsed >= _WINDOW_SEC:
+        _buckets[:] = [0] * _WINDOW_SEC
+        _bucket_sum = 0
+    else:
+        for sec in range(_last_sec + 1, now_sec + 1):
+            i = sec % _WINDOW_SEC
+            _bucket_sum -= _buckets[i]
+            _buckets[i] = 0
+    _last_sec = now_sec
+
+
+def _record_hit() -> None:
+    global _bucket_sum
+    now_sec = int(time.monotonic())
+    _advance(now_sec)
+    _buckets[now_sec % _WINDOW_SEC] += 1
+    _bucket_sum += 1
 
 
 def observe_error(msg: str) -> None:
     """Record error categories and raise metrics counters."""
-    ts = int(time.time())
     if _RE_RATE.search(msg or ""):
-        _RATE_LIMITS.append(ts)
+        _record_hit()
         inc("rate_limit_hits", 1)
         inc("errors", 1)
     elif _RE_TO.search(msg or ""):
-        _TIMEOUTS.append(ts)
+        _record_hit()
         inc("timeouts", 1)
         inc("errors", 1)
     else:
         inc("errors", 1)
 
 
-def _count_recent(q: Deque[int], window_sec: int = 60) -> int:
-    now = int(time.time())
-    return sum(1 for t in q if now - t <= window_sec)
+def is_transient(msg: str) -> bool:
+    """Return True if ``msg`` looks like a rate limit or a timeout."""
+    return bool(_RE_RATE.search(msg or "") or _RE_TO.search(msg or ""))
 
 
 def recommend_extra_delay() -> float:
@@ -47,7 +76,8 @@ def recommend_extra_delay() -> float:
     - >=3 RL/TO in last 60s  -> +5s
     - otherwise               -> +0s
     """
-    n = _count_recent(_RATE_LIMITS, 60) + _count_recent(_TIMEOUTS, 60)
+    _advance(int(time.monotonic()))
+    n = _bucket_sum
     if n >= 5:
         return 10.0
     if n >= 3:
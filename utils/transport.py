@@ -3,23 +3,38 @@
 
 from __future__ import annotations
 
+import asyncio
+import heapq
 import json
+import os
 import random
+import re
 import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from utils.politeness import sleep_jitter, ensure_settled
+from collections.abc import Callable
+from typing import NamedTuple
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from utils.politeness import sleep_jitter, ensure_settled, site_gate
 from utils.humanize import gentle_mouse
 from utils.pretty_print import display_info, display_error
-from utils.eta_filter import parse_km, parse_pct, parse_capacity
+from utils.eta_filter import parse_all
 from data.config_settings import get_transport_prefs
 from utils.metrics import inc, maybe_write
 from utils import sentinel
 
+# Deferrals, attempts and the destination blacklist share one state file.
+STATE_PATH = Path("data/transport_state.json")
+# Pre-consolidation files; read only while STATE_PATH is missing.  They are
+# tracked in git, so they are left in place rather than deleted.
 DEFER_PATH = Path("data/deferred_transports.json")
 BLACKLIST_PATH = Path("data/destination_blacklist.json")
 ATTEMPT_PATH = Path("data/transport_attempts.json")
-# Per-vehicle attempt budget.  We track this in ``transport_attempts.json`` to
-# avoid hammering the same vehicle repeatedly in one execution.
+# Per-vehicle attempt budget.  We track this in the state file's ``attempts``
+# to avoid hammering the same vehicle repeatedly in one execution.
 ATTEMPT_BUDGET = 2
 
 # Escalation: after this many deferrals for the same vehicle, try once ignoring caps
@@ -29,6 +44,25 @@ ESCALATE_AFTER_DEFERS = 3
 SLA_HOSPITAL_MIN = 15
 SLA_PRISON_MIN = 20
 
+# Upper bound on destination rows scanned per modal.
+MODAL_ROW_LIMIT = 300
+# Distance cap multipliers: strict fit first, then widening rungs.
+KM_LADDER = (1.0, 1.25, 1.5, 2.0)
+# Vehicle pages loading faster than this skip the mouse jitter.
+FAST_LOAD_SEC = 0.3
+# Stop scanning a modal after this many strict fits within half the km cap.
+EARLY_EXIT_FITS = 20
+# Destination rows inside the hospital/prison dialog: visible direct
+# table/list children only (no nested wrappers or hidden dialogs), each list
+# capped in the selector itself.
+_ROW_CAP = f":nth-child(-n+{MODAL_ROW_LIMIT}):visible"
+MODAL_ROW_SELECTOR = ", ".join(
+    f"{d} tbody > tr{_ROW_CAP}, {d} ul > li{_ROW_CAP}"
+    for d in (".modal", ".dialog", ".ui-dialog")
+)
+# How long to wait for dialog rows to render before the broad scan (ms).
+MODAL_ROW_WAIT_MS = 2000
+
 
 def _load_json(p: Path):
     """Best-effort JSON loader returning an empty dict on failure."""
@@ -41,136 +75,560 @@ def _load_json(p: Path):
     return {}
 
 
+@dataclass(slots=True)
+class DeferredTransport:
+    """Record of a vehicle whose transport has been deferred."""
+
+    next_check: int = 0
+    defer_count: int = 0
+    first_seen: int = 0
+    reason: str = ""
+    updated: int = 0
+
+    @classmethod
+    def from_dict(cls, data: dict[str, object]) -> DeferredTransport:
+        """Create a record from a raw dict."""
+        return cls(
+            next_check=int(data.get("next_check", 0)),
+            defer_count=int(data.get("defer_count", 0)),
+            first_seen=int(data.get("first_seen", 0)),
+            reason=str(data.get("reason", "")),
+            updated=int(data.get("updated", 0)),
+        )
+
+
+def _defer_from_raw(raw) -> dict[str, DeferredTransport]:
+    """Build typed defer records once, dropping malformed entries."""
+    out: dict[str, DeferredTransport] = {}
+    if isinstance(raw, dict):
+        for k, v in raw.items():
+            try:
+                out[str(k)] = DeferredTransport.from_dict(v)
+            except (AttributeError, TypeError, ValueError):
+                continue
+    return out
+
+
+def _attempts_from_raw(raw) -> dict[str, int]:
+    """Normalise attempt counts to ints once, dropping malformed entries."""
+    out: dict[str, int] = {}
+    if isinstance(raw, dict):
+        for k, v in raw.items():
+            try:
+                out[str(k)] = int(v)
+            except (TypeError, ValueError):
+                continue
+    return out
+
+
+def _load_state(p: Path) -> dict[str, dict]:
+    """Load the consolidated state, migrating the legacy per-kind files."""
+    if p.exists():
+        raw = _load_json(p)
+    else:
+        raw = {
+            "defer": _load_json(DEFER_PATH),
+            "attempts": _load_json(ATTEMPT_PATH),
+            "blacklist": _load_json(BLACKLIST_PATH),
+        }
+    blacklist = raw.get("blacklist")
+    return {
+        "defer": _defer_from_raw(raw.get("defer")),
+        "attempts": _attempts_from_raw(raw.get("attempts")),
+        "blacklist": blacklist if isinstance(blacklist, dict) else {},
+    }
+
+
+def _save_state(p: Path, data: dict[str, dict]) -> None:
+    """Persist the consolidated state; legacy files are ignored from now on."""
+    _save_json(
+        p,
+        {
+            "defer": {k: asdict(v) for k, v in data["defer"].items()},
+            "attempts": data["attempts"],
+            "blacklist": data["blacklist"],
+        },
+    )
+
+
 def _save_json(p: Path, d: dict) -> None:
-    """Persist ``d`` to ``p``; log but ignore on error."""
+    """Atomically persist ``d`` to ``p``; log but ignore on error."""
     try:
         p.parent.mkdir(parents=True, exist_ok=True)
-        with p.open("w", encoding="utf-8") as f:
+        tmp = p.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
             json.dump(d, f, indent=2)
+        os.replace(tmp, p)
     except Exception as e:  # pragma: no cover - I/O failures are rare
         display_error(f"Could not save {p.name}: {e}")
 
 
-def _row_label(text: str) -> str:
-    """Normalise a row label for blacklist lookups."""
-    return (text or "").strip().lower()[:60]
+# Parsed state files keyed by path, reused while (mtime, size) is unchanged.
+_FILE_CACHE: dict[Path, tuple[tuple[int, int], dict]] = {}
 
 
-async def _choose_destination_from_modal(
-    page, prefs, mode: str, blacklist: dict, *, escalate_override: bool = False
-):
-    """Handle the modal listing hospitals or prisons and choose a destination."""
-    rows = page.locator(
+def _stat_key(p: Path) -> tuple[int, int] | None:
+    try:
+        st = p.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _load_cached(p: Path, load: Callable[[Path], dict]) -> dict:
+    """Return ``load(p)``, skipping the parse when the file is unchanged."""
+    key = _stat_key(p)
+    hit = _FILE_CACHE.get(p)
+    if key is not None and hit is not None and hit[0] == key:
+        return hit[1]
+    data = load(p)
+    if key is None:
+        _FILE_CACHE.pop(p, None)
+    else:
+        _FILE_CACHE[p] = (key, data)
+    return data
+
+
+def _save_cached(p: Path, save: Callable[[Path, dict], None], data: dict) -> None:
+    """Persist ``data`` with ``save`` and remember it as the file's contents."""
+    save(p, data)
+    key = _stat_key(p)
+    if key is not None:
+        _FILE_CACHE[p] = (key, data)
+
+
+def _evict_expired(blacklist: dict, now: int) -> bool:
+    """Drop expired (or malformed) blacklist entries; return True if any."""
+    stale = [
+        lab
+        for lab, until in blacklist.items()
+        if not isinstance(until, (int, float)) or until <= now
+    ]
+    for lab in stale:
+        del blacklist[lab]
+    return bool(stale)
+
+
+# Returns [index, text, label] for the first ``n`` rows whose blacklist
+# label (trimmed, lowercased, first 60 chars) is not in ``bl``; indices refer
+# to the unfiltered locator.
+_MODAL_ROWS_JS = """
+(els, [n, bl]) => {
+  const s = new Set(bl);
+  const out = [];
+  els.slice(0, n).forEach((e, i) => {
+    const t = (e.innerText || '').trim();
+    if (!t) return;
+    const label = t.toLowerCase().slice(0, 60);
+    if (!s.has(label)) out.push([i, t, label]);
+  });
+  return out;
+}
+"""
+
+
+async def _modal_rows(page):
+    """Return the destination row locator, preferring list/table rows in a dialog.
+
+    Waits briefly for visible dialog rows, then falls back to the historical
+    broad scan (every li/tr/div, including the page body).
+    """
+    rows = page.locator(MODAL_ROW_SELECTOR)
+    try:
+        await rows.first.wait_for(state="visible", timeout=MODAL_ROW_WAIT_MS)
+        return rows
+    except Exception:
+        pass
+    return page.locator(
         "div.modal, .modal, .dialog, .ui-dialog, .popover, body"
     ).locator("li, tr, div")
-    n = min(await rows.count(), 300)
-    candidates = []
-    now = int(time.time())
-    ttl = int(prefs.get("blacklist_ttl_min", 45)) * 60
-    min_free = int(
-        prefs.get("min_free_beds" if mode == "hospital" else "min_free_cells", 1)
-    )
 
-    for i in range(n):
-        r = rows.nth(i)
-        try:
-            t = (await r.inner_text()).strip()
-            if not t:
-                continue
-            lab = _row_label(t)
-            if lab in blacklist and blacklist[lab] > now:
-                continue
-            d = parse_km(t)
-            p = parse_pct(t)
-            free, _ = parse_capacity(t)
-            candidates.append(
-                {"i": i, "text": t, "label": lab, "km": d, "pct": p, "free": free}
-            )
-        except Exception:
-            continue
-    if not candidates:
-        return None
 
+@dataclass(frozen=True, slots=True)
+class TransportCaps:
+    """Parsed destination limits for one mode (hospital or prison)."""
+
+    max_km: float
+    max_pct: float
+    min_free: int
+    ttl_s: int
+    # max_km pre-multiplied by each KM_LADDER rung.
+    km_ladder: tuple[float, ...]
+
+
+_CAPS_CACHE: dict[str, tuple[dict, TransportCaps]] = {}
+
+
+def _transport_caps(prefs: dict, mode: str) -> TransportCaps:
+    """Return ``mode``'s caps, re-parsing only for a new ``prefs`` dict."""
+    # get_transport_prefs() is cached and rebuilt on config reload, so the
+    # dict's identity changes exactly when its contents do.
+    hit = _CAPS_CACHE.get(mode)
+    if hit is not None and hit[0] is prefs:
+        return hit[1]
     if mode == "hospital":
         max_km = float(prefs["max_hospital_km"])
         max_pct = float(prefs["max_hospital_tax_pct"])
+        min_free = int(prefs.get("min_free_beds", 1))
     else:
         max_km = float(prefs["max_prison_km"])
         max_pct = float(prefs["max_prison_tax_pct"])
+        min_free = int(prefs.get("min_free_cells", 1))
+    caps = TransportCaps(
+        max_km=max_km,
+        max_pct=max_pct,
+        min_free=min_free,
+        ttl_s=int(prefs.get("blacklist_ttl_min", 45)) * 60,
+        km_ladder=tuple(max_km * m for m in KM_LADDER),
+    )
+    _CAPS_CACHE[mode] = (prefs, caps)
+    return caps
+
+
+class _Candidate(NamedTuple):
+    """One parsed destination row; ``i`` indexes the modal row locator."""
+
+    pct: float
+    km: float
+    free: int | None
+    i: int
+    label: str
+
+
+def _rank(c: _Candidate) -> tuple[float, float]:
+    """Candidate preference: lowest tax first, then nearest."""
+    return (c.pct, c.km)
+
 
-    def fits(c, km_mult=1.0):
+def _pick_destination(
+    candidates: list[_Candidate], caps: TransportCaps
+) -> tuple[_Candidate, int] | None:
+    """Return the preferred candidate and its ``KM_LADDER`` rung (0 = strict fit).
+
+    One pass finds the best strict fit and, for every widened rung, the best
+    candidate whose km first falls under that rung (km only).  The first
+    non-empty rung wins: lower rungs are empty, so its own best is the best
+    of everything within its km limit.
+    """
+    strict_best = None
+    rung_best: list[_Candidate | None] = [None] * len(KM_LADDER)
+    for c in candidates:
+        if not (c.free is None or c.free >= caps.min_free):
+            continue
+        if (
+            c.km <= caps.max_km
+            and c.pct <= caps.max_pct
+            and (strict_best is None or _rank(c) < _rank(strict_best))
+        ):
+            strict_best = c
+        for r in range(1, len(KM_LADDER)):
+            if c.km <= caps.km_ladder[r]:
+                if rung_best[r] is None or _rank(c) < _rank(rung_best[r]):
+                    rung_best[r] = c
+                break
+    if strict_best is not None:
+        return strict_best, 0
+    for r in range(1, len(KM_LADDER)):
+        if rung_best[r] is not None:
+            return rung_best[r], r
+    return None
+
+
+async def _choose_destination_from_modal(
+    page,
+    prefs,
+    mode: str,
+    blacklist: dict,
+    *,
+    escalate_override: bool = False,
+    dirty: dict[str, bool] | None = None,
+    now: int | None = None,
+):
+    """Handle the modal listing hospitals or prisons and choose a destination.
+
+    ``now`` is the caller's timestamp for this vehicle; it is read from the
+    clock only when not supplied.
+    """
+    if now is None:
+        now = int(time.time())
+    rows = await _modal_rows(page)
+    # Expired entries are pruned here too, so what remains is the active set;
+    # blacklisted rows are dropped in the page so only viable ones are parsed.
+    if _evict_expired(blacklist, now) and dirty is not None:
+        dirty["blacklist"] = True
+    live_bl = list(blacklist)
+    try:
+        rows_in = await rows.evaluate_all(_MODAL_ROWS_JS, [MODAL_ROW_LIMIT, live_bl])
+    except Exception:
+        rows_in = []
+    candidates: list[_Candidate] = []
+    caps = _transport_caps(prefs, mode)
+    max_km, max_pct, min_free = caps.max_km, caps.max_pct, caps.min_free
+
+    def fits(c):
         return (
-            (c["km"] <= max_km * km_mult)
-            and (c["pct"] <= max_pct)
-            and (c["free"] is None or c["free"] >= min_free)
+            (c.km <= max_km)
+            and (c.pct <= max_pct)
+            and (c.free is None or c.free >= min_free)
         )
 
+    # Outside escalation, stop parsing once enough close strict fits are in.
+    close_fits = 0
+    for i, t, label in rows_in:
+        try:
+            d, p, free = parse_all(t)
+            c = _Candidate(p, d, free, i, label)
+            candidates.append(c)
+            if not escalate_override and c.km < 0.5 * max_km and fits(c):
+                close_fits += 1
+                if close_fits >= EARLY_EXIT_FITS:
+                    break
+        except Exception:
+            continue
+    if not candidates:
+        return None
+
     # Escalation override: ignore caps, still prefer capacity + low tax + nearer
     if escalate_override:
-        best = [c for c in candidates if (c["free"] is None or c["free"] >= min_free)]
+        best = [c for c in candidates if (c.free is None or c.free >= min_free)]
         if not best:
-            best = candidates[:]
-        best.sort(key=lambda c: (c["pct"], c["km"]))
-        chosen = best[0]
-        ctl = rows.nth(chosen["i"]).locator("a, button, input[type=submit]").first
+            best = candidates
+        chosen = min(best, key=_rank)
+        ctl = rows.nth(chosen.i).locator("a, button, input[type=submit]").first
         try:
             await ctl.click()
             await ensure_settled(page)
-            display_info(
-                f"ESCALATE override → picked {chosen['km']:.1f}km, {chosen['pct']}%"
-            )
+            display_info(f"ESCALATE override → picked {chosen.km:.1f}km, {chosen.pct}%")
             return True
         except Exception:
             return None
 
-    # Normal strict fit first
-    strict = [c for c in candidates if fits(c, 1.0)]
-    if strict:
-        strict.sort(key=lambda c: (c["pct"], c["km"]))
-        chosen = strict[0]
-        ctl = rows.nth(chosen["i"]).locator("a, button, input[type=submit]").first
+    picked = _pick_destination(candidates, caps)
+    if picked is not None:
+        chosen, rung = picked
+        ctl = rows.nth(chosen.i).locator("a, button, input[type=submit]").first
         try:
             await ctl.click()
             await ensure_settled(page)
+            if rung:
+                display_info(
+                    f"Ladder: widened x{KM_LADDER[rung]:.2f} → picked {chosen.km:.1f}km, {chosen.pct}%"
+                )
             return True
         except Exception:
             return None
 
-    # Ladder widening (km only)
-    for mult in (1.25, 1.5, 2.0):
-        widened = [
-            c
-            for c in candidates
-            if (c["km"] <= max_km * mult)
-            and (c["free"] is None or c["free"] >= min_free)
-        ]
-        if widened:
-            widened.sort(key=lambda c: (c["pct"], c["km"]))
-            chosen = widened[0]
-            ctl = rows.nth(chosen["i"]).locator("a, button, input[type=submit]").first
+    # Nothing matched — blacklist the best few so next pass tries different ones
+    for c in heapq.nsmallest(5, candidates, key=_rank):
+        blacklist[c.label] = now + caps.ttl_s
+    if dirty is not None and candidates:
+        dirty["blacklist"] = True
+    return None
+
+
+@dataclass(slots=True)
+class _CycleState:
+    """Transport state shared by the vehicles handled in one cycle."""
+
+    defer: dict[str, DeferredTransport]
+    attempts: dict[str, int]
+    blacklist: dict
+    # Sections changed this cycle; the state file is rewritten only if any did.
+    dirty: dict[str, bool] = field(
+        default_factory=lambda: {"defer": False, "blacklist": False, "attempts": False}
+    )
+
+    # Metric increments, flushed to utils.metrics once per cycle.
+    counters: Counter = field(default_factory=Counter)
+
+    def is_due(self, vehicle_id: str, now: int) -> bool:
+        """Return False if ``vehicle_id`` is deferred or out of attempts."""
+        rec = self.defer.get(vehicle_id)
+        if rec is not None and rec.next_check > now:
+            return False
+        return self.attempts.get(vehicle_id, 0) < ATTEMPT_BUDGET
+
+    def priority(self, vehicle_id: str, now: int) -> tuple[bool, int, int]:
+        """Sort key: due vehicles first, then most deferrals, then oldest."""
+        rec = self.defer.get(vehicle_id)
+        if rec is None:
+            return (not self.is_due(vehicle_id, now), 0, now)
+        return (
+            not self.is_due(vehicle_id, now),
+            -rec.defer_count,
+            rec.first_seen or now,
+        )
+
+    def clear_defer(self, vehicle_id: str) -> None:
+        if self.defer.pop(vehicle_id, None) is not None:
+            self.dirty["defer"] = True
+
+
+# Button caption keyword -> destination mode.  Hospital wording takes
+# precedence when a caption matches both.
+_ACTIONS = {
+    "hospital": "hospital",
+    "transport": "hospital",
+    "prison": "prison",
+    "jail": "prison",
+}
+_ACTION_RE = re.compile("|".join(_ACTIONS))
+
+
+def _button_mode(text: str) -> str | None:
+    """Return "hospital", "prison" or None for a vehicle page button caption."""
+    modes = {_ACTIONS[k] for k in _ACTION_RE.findall(text.lower())}
+    if "hospital" in modes:
+        return "hospital"
+    return "prison" if modes else None
+
+
+async def _send_or_defer(
+    page,
+    vehicle_id: str,
+    mode: str,
+    rec: DeferredTransport,
+    prefs,
+    state: _CycleState,
+    now: int,
+) -> None:
+    """Pick a destination in the open dialog, escalating or deferring if none fits."""
+    sla_min = SLA_HOSPITAL_MIN if mode == "hospital" else SLA_PRISON_MIN
+    # SLA override?
+    sla_due = (now - rec.first_seen) >= (sla_min * 60)
+    ok = await _choose_destination_from_modal(
+        page,
+        prefs,
+        mode=mode,
+        blacklist=state.blacklist,
+        escalate_override=sla_due,
+        dirty=state.dirty,
+        now=now,
+    )
+    if ok:
+        state.counters["transports_completed"] += 1
+        state.clear_defer(vehicle_id)
+        return
+
+    # fallback logic with escalation-after-N-defers
+    if prefs.get(f"{mode}_fallback", "wait") != "wait":
+        return
+    new_count = rec.defer_count + 1
+    if new_count >= ESCALATE_AFTER_DEFERS:
+        ok2 = await _choose_destination_from_modal(
+            page,
+            prefs,
+            mode=mode,
+            blacklist=state.blacklist,
+            escalate_override=True,
+            dirty=state.dirty,
+            now=now,
+        )
+        if ok2:
+            state.counters["transports_completed"] += 1
+            display_info(
+                f"Vehicle {vehicle_id}: ESCALATE → sent beyond caps after {new_count} defers."
+            )
+            state.clear_defer(vehicle_id)
+            return
+    minutes = max(1, int(prefs.get(f"{mode}_recheck_min", 10)))
+    state.defer[vehicle_id] = DeferredTransport(
+        next_check=now + minutes * 60,
+        reason=f"{mode} limits",
+        updated=now,
+        defer_count=new_count,
+        first_seen=rec.first_seen,
+    )
+    state.dirty["defer"] = True
+    state.counters["transports_deferred"] += 1
+    display_info(
+        f"Vehicle {vehicle_id}: deferring {mode} transport {minutes} min. (n={new_count})"
+    )
+
+
+async def _process_vehicle(page, vehicle_id: str, prefs, state: _CycleState) -> None:
+    """Open one vehicle page and send, defer or release its transport."""
+    # One clock read per vehicle, shared by SLA, defer and blacklist checks.
+    now = int(time.time())
+    try:
+        rec = state.defer.get(vehicle_id) or DeferredTransport(first_seen=now)
+        # Track first_seen for SLA
+        if rec.first_seen == 0:
+            rec.first_seen = now
+            state.dirty["defer"] = True
+
+        if rec.next_check > now:
+            return
+
+        ntry = state.attempts.get(vehicle_id, 0)
+        if ntry >= ATTEMPT_BUDGET:
+            return
+        state.attempts[vehicle_id] = ntry + 1
+        state.dirty["attempts"] = True
+
+        try:
+            t0 = time.perf_counter()
+            await page.goto(f"https://www.missionchief.com/vehicles/{vehicle_id}")
+            dt = time.perf_counter() - t0
+            await ensure_settled(page)
+            # Mouse jitter scales with real load time; skipped on fast loads
+            # unless the sentinel is asking us to slow down.
+            fast = dt < FAST_LOAD_SEC and sentinel.recommend_extra_delay() == 0.0
+            if not fast and random.random() < min(1.0, dt):
+                await gentle_mouse(page)
+            # Reauth check
             try:
-                await ctl.click()
+                if "sign_in" in (page.url or "") or "login" in (page.url or ""):
+                    inc("reauths", 1)
+                    maybe_write()
+                    display_info("[auth] session reauth detected at vehicle page.")
+            except Exception:
+                pass
+        except Exception as e:
+            display_error(f"Vehicle open failed for {vehicle_id}: {e}")
+            sentinel.observe_error(str(e))
+            return
+
+        buttons = page.locator("a.btn-success, button.btn-success")
+        clicked = False
+        try:
+            captions = await buttons.all_inner_texts()
+        except Exception:
+            captions = []
+        for i, caption in enumerate(captions):
+            mode = _button_mode(caption or "")
+            if mode is None:
+                continue
+            try:
+                await buttons.nth(i).click()
                 await ensure_settled(page)
-                display_info(
-                    f"Ladder: widened x{mult:.2f} → picked {chosen['km']:.1f}km, {chosen['pct']}%"
-                )
-                return True
+                await _send_or_defer(page, vehicle_id, mode, rec, prefs, state, now)
+                clicked = True
+                break
             except Exception:
-                return None
+                pass
 
-    # Nothing matched — blacklist top few so next pass tries different
-    for c in candidates[:5]:
-        blacklist[c["label"]] = now + ttl
-    return None
+        if not clicked:
+            release = page.locator("a.btn.btn-xs.btn-danger").first
+            try:
+                # click() auto-waits; a short timeout bounds the no-button case.
+                await release.click(timeout=800)
+                await ensure_settled(page)
+                display_info(f"Released at vehicle {vehicle_id}")
+            except PlaywrightTimeoutError:
+                pass
 
+        await sleep_jitter(0.2, 0.4)
+    except Exception as e:
+        display_error(f"Transport error: {e}")
+        sentinel.observe_error(str(e))
 
-async def handle_transport_requests(browser):
-    """Process pending hospital or prison transport requests."""
-    prefs = get_transport_prefs()
-    page = browser.contexts[0].pages[0]
+
+async def _open_home(page) -> bool:
+    """Load the home page holding the request list; False if navigation failed."""
     try:
         await page.goto("https://www.missionchief.com")
-        await ensure_settled(page)
+        await ensure_settled(page, idle=True)
         await gentle_mouse(page)
         # Session drift monitor
         try:
@@ -183,207 +641,101 @@ async def handle_transport_requests(browser):
     except Exception as e:
         display_error(f"Transport navigation failed: {e}")
         sentinel.observe_error(str(e))
+        return False
+    return True
+
+
+async def handle_transport_requests(browser):
+    """Process pending hospital or prison transport requests."""
+    prefs = get_transport_prefs()
+    page = browser.contexts[0].pages[0]
+    # The state file is read in a worker thread while the home page loads,
+    # so the event loop (and the mission loop sharing it) never blocks on disk.
+    opened, data = await asyncio.gather(
+        _open_home(page), asyncio.to_thread(_load_cached, STATE_PATH, _load_state)
+    )
+    if not opened:
         return
 
-    requests = await page.query_selector_all("ul#radio_messages_important li")
-    total = len(requests)
+    # One round-trip for every request row's vehicle id (null when missing).
+    try:
+        row_ids = await page.eval_on_selector_all(
+            "ul#radio_messages_important li",
+            """els => els.map(li => {
+                const img = li.querySelector('img');
+                return img ? img.getAttribute('vehicle_id') : null;
+            })""",
+        )
+    except Exception as e:
+        display_error(f"Transport request scan failed: {e}")
+        row_ids = []
+    total = len(row_ids)
+    # The same vehicle can appear more than once in the feed.
+    vehicle_ids = list(dict.fromkeys(vid for vid in row_ids if vid))
+
+    state = _CycleState(
+        defer=data["defer"], attempts=data["attempts"], blacklist=data["blacklist"]
+    )
+    now = int(time.time())
+    if _evict_expired(state.blacklist, now):
+        state.dirty["blacklist"] = True
+
+    # Due, most-deferred, longest-waiting vehicles first so SLA escalations
+    # are not cut off by the per-cycle cap.
+    vehicle_ids.sort(key=lambda v: state.priority(v, now))
     cap = random.randint(122, 189)  # per docs
-    requests = requests[:cap]
+    vehicle_ids = vehicle_ids[:cap]
     display_info(
-        f"Found {total} transport requests; processing up to {len(requests)} this cycle."
+        f"Found {total} transport requests; processing up to {len(vehicle_ids)} this cycle."
     )
 
-    vehicle_ids = []
-    for req in requests:
-        try:
-            img = await req.query_selector("img")
-            vehicle_id = await img.get_attribute("vehicle_id") if img else None
-            if vehicle_id:
-                vehicle_ids.append(vehicle_id)
-        except Exception:
-            continue
-
     request_count = len(vehicle_ids)
     inc("transports_seen", request_count)
 
-    defer = _load_json(DEFER_PATH)
-    attempts = _load_json(ATTEMPT_PATH)
-    blacklist = _load_json(BLACKLIST_PATH)
-    now = int(time.time())
-
-    for vehicle_id in vehicle_ids:
+    # Skip deferred or over-budget vehicles before paying for a navigation.
+    vehicle_ids = [v for v in vehicle_ids if state.is_due(v, now)]
+
+    # Vehicles are handled concurrently on a small pool of pages (opt-in via
+    # transport_workers).  Parallel workers go through site_gate() so they
+    # share the global concurrency cap.  No update to the shared state spans
+    # an await, so no lock is needed.
+    workers = max(1, min(int(prefs.get("transport_workers", 1)), len(vehicle_ids)))
+    pool: asyncio.Queue = asyncio.Queue()
+    pool.put_nowait(page)
+    extra_pages = []
+    for _ in range(workers - 1):
         try:
-            rec = defer.get(
-                vehicle_id, {"next_check": 0, "defer_count": 0, "first_seen": now}
-            )
-            # Track first_seen for SLA
-            if int(rec.get("first_seen", 0)) == 0:
-                rec["first_seen"] = now
-
-            if int(rec.get("next_check", 0)) > now:
-                continue
+            extra_pages.append(await browser.contexts[0].new_page())
+        except Exception as e:
+            display_error(f"Transport worker page failed: {e}")
+            break
+    for p in extra_pages:
+        pool.put_nowait(p)
 
-            ntry = int(attempts.get(vehicle_id, 0))
-            if ntry >= ATTEMPT_BUDGET:
-                continue
-            attempts[vehicle_id] = ntry + 1
+    async def _worker(vehicle_id: str) -> None:
+        wpage = await pool.get()
+        try:
+            if workers > 1:
+                async with site_gate():
+                    await _process_vehicle(wpage, vehicle_id, prefs, state)
+            else:
+                await _process_vehicle(wpage, vehicle_id, prefs, state)
+        finally:
+            pool.put_nowait(wpage)
 
+    try:
+        await asyncio.gather(*(_worker(v) for v in vehicle_ids))
+    finally:
+        for p in extra_pages:
             try:
-                await page.goto(f"https://www.missionchief.com/vehicles/{vehicle_id}")
-                await ensure_settled(page)
-                await gentle_mouse(page)
-                # Reauth check
-                try:
-                    if "sign_in" in (page.url or "") or "login" in (page.url or ""):
-                        inc("reauths", 1)
-                        maybe_write()
-                        display_info("[auth] session reauth detected at vehicle page.")
-                except Exception:
-                    pass
-            except Exception as e:
-                display_error(f"Vehicle open failed for {vehicle_id}: {e}")
-                sentinel.observe_error(str(e))
-                continue
-
-            buttons = page.locator("a.btn-success, button.btn-success")
-            clicked = False
-            count = await buttons.count()
-            for i in range(count):
-                b = buttons.nth(i)
-                try:
-                    txt = (await b.inner_text() or "").lower()
-                    if "hospital" in txt or "transport" in txt:
-                        await b.click()
-                        await ensure_settled(page)
-                        # SLA override?
-                        sla_due = (now - int(rec["first_seen"])) >= (
-                            SLA_HOSPITAL_MIN * 60
-                        )
-                        ok = await _choose_destination_from_modal(
-                            page,
-                            prefs,
-                            mode="hospital",
-                            blacklist=blacklist,
-                            escalate_override=sla_due,
-                        )
-                        if ok:
-                            inc("transports_completed", 1)
-                            clicked = True
-                            defer.pop(vehicle_id, None)
-                            break
-
-                        # fallback logic with escalation-after-N-defers
-                        if prefs.get("hospital_fallback", "wait") == "wait":
-                            new_count = int(rec.get("defer_count", 0)) + 1
-                            if new_count >= ESCALATE_AFTER_DEFERS:
-                                ok2 = await _choose_destination_from_modal(
-                                    page,
-                                    prefs,
-                                    mode="hospital",
-                                    blacklist=blacklist,
-                                    escalate_override=True,
-                                )
-                                if ok2:
-                                    inc("transports_completed", 1)
-                                    clicked = True
-                                    display_info(
-                                        f"Vehicle {vehicle_id}: ESCALATE → sent beyond caps after {new_count} defers."
-                                    )
-                                    defer.pop(vehicle_id, None)
-                                    break
-                            minutes = max(1, int(prefs.get("hospital_recheck_min", 10)))
-                            defer[vehicle_id] = {
-                                "next_check": now + minutes * 60,
-                                "reason": "hospital limits",
-                                "updated": now,
-                                "defer_count": new_count,
-                                "first_seen": int(rec["first_seen"]),
-                            }
-                            inc("transports_deferred", 1)
-                            display_info(
-                                f"Vehicle {vehicle_id}: deferring hospital transport {minutes} min. (n={new_count})"
-                            )
-                            clicked = True
-                            break
-                        else:
-                            clicked = True
-                            break
-
-                    if "prison" in txt or "jail" in txt:
-                        await b.click()
-                        await ensure_settled(page)
-                        sla_due = (now - int(rec["first_seen"])) >= (
-                            SLA_PRISON_MIN * 60
-                        )
-                        ok = await _choose_destination_from_modal(
-                            page,
-                            prefs,
-                            mode="prison",
-                            blacklist=blacklist,
-                            escalate_override=sla_due,
-                        )
-                        if ok:
-                            inc("transports_completed", 1)
-                            clicked = True
-                            defer.pop(vehicle_id, None)
-                            break
-
-                        if prefs.get("prison_fallback", "wait") == "wait":
-                            new_count = int(rec.get("defer_count", 0)) + 1
-                            if new_count >= ESCALATE_AFTER_DEFERS:
-                                ok2 = await _choose_destination_from_modal(
-                                    page,
-                                    prefs,
-                                    mode="prison",
-                                    blacklist=blacklist,
-                                    escalate_override=True,
-                                )
-                                if ok2:
-                                    inc("transports_completed", 1)
-                                    clicked = True
-                                    display_info(
-                                        f"Vehicle {vehicle_id}: ESCALATE → sent beyond caps after {new_count} defers."
-                                    )
-                                    defer.pop(vehicle_id, None)
-                                    break
-                            minutes = max(1, int(prefs.get("prison_recheck_min", 10)))
-                            defer[vehicle_id] = {
-                                "next_check": now + minutes * 60,
-                                "reason": "prison limits",
-                                "updated": now,
-                                "defer_count": new_count,
-                                "first_seen": int(rec["first_seen"]),
-                            }
-                            inc("transports_deferred", 1)
-                            display_info(
-                                f"Vehicle {vehicle_id}: deferring prison transport {minutes} min. (n={new_count})"
-                            )
-                            clicked = True
-                            break
-                        else:
-                            clicked = True
-                            break
-                except Exception:
-                    pass
-
-            if not clicked:
-                release = page.locator("a.btn.btn-xs.btn-danger").first
-                try:
-                    await release.wait_for(state="visible", timeout=2000)
-                    await release.click()
-                    await ensure_settled(page)
-                    display_info(f"Released at vehicle {vehicle_id}")
-                except Exception:
-                    pass
-
-            await sleep_jitter(0.2, 0.4)
-        except Exception as e:
-            display_error(f"Transport error: {e}")
-            sentinel.observe_error(str(e))
+                await p.close()
+            except Exception:
+                pass
 
-    _save_json(DEFER_PATH, defer)
-    _save_json(BLACKLIST_PATH, blacklist)
-    _save_json(ATTEMPT_PATH, attempts)
+    for name, n in state.counters.items():
+        inc(name, n)
+    if any(state.dirty.values()):
+        await asyncio.to_thread(_save_cached, STATE_PATH, _save_state, data)
     maybe_write()
 
     # Adaptive pacing: fewer requests → longer rest; consider sentinel hint
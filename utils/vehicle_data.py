@@ -24,28 +24,31 @@ async def gather_vehicle_data(browsers, count) -> None:
         await goto_safe(page, "https://www.missionchief.com")
         await ensure_settled(page)
 
-        # Fetch the vehicle list using the in-page fetch API to preserve cookies
+        # Fetch the vehicle list using the in-page fetch API to preserve
+        # cookies, and reduce it to the compact mapping in the page so the
+        # full vehicle objects never cross into Python.
         async with asyncio.timeout(10):
-            data: list[dict[str, Any]] = await page.evaluate(
+            mapped: dict[str, dict[str, Any]] = await page.evaluate(
                 """async () => {
                     const r = await fetch('/api/vehicles');
-                    if (!r.ok) { return []; }
-                    return await r.json();
+                    if (!r.ok) { return {}; }
+                    const out = {};
+                    for (const v of await r.json()) {
+                        if (!v || typeof v !== 'object' || v.id == null) continue;
+                        out[String(v.id)] = {
+                            caption: 'caption' in v ? v.caption : '',
+                            type: 'vehicle_type' in v ? v.vehicle_type
+                                : ('type' in v ? v.type : ''),
+                        };
+                    }
+                    return out;
                 }"""
             )
 
-        mapped = {
-            str(v.get("id")): {
-                "caption": v.get("caption", ""),
-                "type": v.get("vehicle_type", v.get("type", "")),
-            }
-            for v in data
-            if isinstance(v, dict)
-        }
-
         data_path = Path("data") / "vehicle_data.json"
         data_path.parent.mkdir(parents=True, exist_ok=True)
-        data_path.write_text(json.dumps(mapped, indent=2), encoding="utf-8")
+        with data_path.open("w", encoding="utf-8") as f:
+            json.dump(mapped, f, indent=2)
         display_info(f"Fetched {len(mapped)} vehicles → {data_path}")
 
     except Exception as e:  # pragma: no cover - network/DOM failures